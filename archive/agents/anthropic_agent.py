@@ -2,11 +2,19 @@
 Anthropic Claude agent — uses tool_use to enforce JSON output.
 """
 from __future__ import annotations
-import json
 import os
+from collections import deque
+
+import orjson
+
+try:
+    import anthropic
+except ImportError:
+    raise ImportError("anthropic package not installed. Run: pip install anthropic")
 
 from agents.base import Agent
-from prompts.builder import SYSTEM_PROMPT
+from prompts.builder import Observation, get_system_prompt
+from agents.obs_compact import COMPACT_SCHEMA_NOTE, compact, json_default
 
 ACTION_TOOL = {
     "name": "submit_action",
@@ -92,43 +100,45 @@ class AnthropicAgent(Agent):
                 "ANTHROPIC_API_KEY is not set. "
                 "Export it with: export ANTHROPIC_API_KEY=sk-ant-..."
             )
-        try:
-            import anthropic
-            self._client = anthropic.Anthropic(api_key=api_key)
-        except ImportError:
-            raise ImportError("anthropic package not installed. Run: pip install anthropic")
-        self._history: list[dict] = []
+        self._aclient = anthropic.AsyncAnthropic(api_key=api_key)
+        self._history: deque[dict] = deque(maxlen=20)
+        # Persona-static: format once instead of re-scanning the template per turn.
+        # cache_control marks the prompt and tool schema as cache-eligible so the
+        # provider reuses its KV cache for the static prefix across turns.
+        self._system = [{
+            "type": "text",
+            "text": get_system_prompt(persona) + "\n\n" + COMPACT_SCHEMA_NOTE,
+            "cache_control": {"type": "ephemeral"},
+        }]
+        self._tools = [{**ACTION_TOOL, "cache_control": {"type": "ephemeral"}}]
 
-    def get_action(self, observation: dict) -> dict:
-        import anthropic
-        obs_text = json.dumps(observation, indent=2)
-        system = SYSTEM_PROMPT.format(persona=self.persona)
+    async def aget_action(self, observation: Observation) -> dict:
+        obs_text = orjson.dumps(compact(observation), default=json_default).decode()
         user_msg = (
             f"Current game state observation:\n```json\n{obs_text}\n```\n\n"
             "Call the submit_action tool with your orders for this turn."
         )
         try:
-            messages = self._history + [{"role": "user", "content": user_msg}]
-            response = self._client.messages.create(
+            messages = [*self._history, {"role": "user", "content": user_msg}]
+            response = await self._aclient.messages.create(
                 model=self.model_id,
                 max_tokens=1024,
-                system=system,
-                tools=[ACTION_TOOL],
+                system=self._system,
+                tools=self._tools,
                 tool_choice={"type": "any"},
                 messages=messages,
             )
-            # Extract tool use input
-            action = {}
-            for block in response.content:
-                if block.type == "tool_use" and block.name == "submit_action":
-                    action = block.input
-                    break
+            # Extract tool use input (usually the first content block)
+            action = next(
+                (b.input for b in response.content
+                 if getattr(b, "type", None) == "tool_use"
+                 and getattr(b, "name", None) == "submit_action"),
+                {},
+            )
             # Update rolling history (text summary avoids tool_result requirement)
-            action_text = json.dumps(action, indent=2) if action else "{}"
+            action_text = orjson.dumps(action, option=orjson.OPT_INDENT_2).decode() if action else "{}"
             self._history.append({"role": "user", "content": user_msg})
             self._history.append({"role": "assistant", "content": f"Action submitted:\n```json\n{action_text}\n```"})
-            if len(self._history) > 20:
-                self._history = self._history[-20:]
             return action
         except anthropic.APIError as e:
             raise RuntimeError(f"Anthropic API error: {e}") from e
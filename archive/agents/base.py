@@ -2,7 +2,12 @@
 Abstract Agent base class.
 """
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from prompts.builder import Observation
 
 
 class Agent(ABC):
@@ -11,9 +16,13 @@ class Agent(ABC):
         self.persona = persona
 
     @abstractmethod
-    def get_action(self, observation: dict) -> dict:
+    async def aget_action(self, observation: "Observation") -> dict:
         """
-        Given an observation dict, return an action dict with keys:
+        Given an observation, return an action dict with keys:
         train, build, move, attack.
         """
         ...
+
+    def get_action(self, observation: "Observation") -> dict:
+        """Synchronous wrapper around aget_action for non-async callers."""
+        return asyncio.run(self.aget_action(observation))
@@ -0,0 +1,83 @@
+"""
+Compact observation projection — trims prompt tokens before serialization.
+
+The raw observation dict carries every zone and every field each turn, so
+prompt size grows with game complexity. compact() drops what the model can
+infer: zones with nothing in them, empty lists/dicts, and zero bonuses.
+The schema note below is appended to the system prompt so the model knows
+a missing key means empty/zero.
+"""
+from __future__ import annotations
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from prompts.builder import Observation
+
+COMPACT_SCHEMA_NOTE = (
+    "NOTE: observations are compacted — your_state.units and "
+    "enemy_units_by_zone omit zones with no units (enemy_units_by_zone only "
+    "covers zones you can see), and empty lists/dicts and zero bonuses are "
+    "dropped. A missing zone or key simply means empty/zero/not visible."
+)
+
+
+def json_default(o):
+    """Serializer fallback for engine types that reach the encoder raw.
+
+    The observation carries the live production queue (a deque of
+    ProductionItem) so nothing is materialised unless actually encoded.
+    """
+    if isinstance(o, deque):
+        return list(o)
+    to_dict = getattr(o, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"not JSON serializable: {type(o).__name__}")
+
+
+@lru_cache(maxsize=64)
+def _stable_block(age: int, upgrades: tuple,
+                  attack_bonus: int, armor_bonus: int) -> dict:
+    """Slow-changing your_state fields, rebuilt only when one of them
+    changes — a handful of times per game rather than every turn. The
+    returned dict is shared across calls; callers merge, never mutate."""
+    block = {"age": age}
+    if upgrades:
+        block["upgrades"] = upgrades
+    if attack_bonus:
+        block["attack_bonus"] = attack_bonus
+    if armor_bonus:
+        block["armor_bonus"] = armor_bonus
+    return block
+
+
+def compact(obs: "Observation") -> dict:
+    """Project an observation onto a minimal token-efficient dict."""
+    ys = obs.your_state
+    your_state = {
+        "resources": ys["resources"],
+        "units": {z: u for z, u in ys["units"].items() if u},
+        "town_center_hp": ys["town_center_hp"],
+    }
+    for key in ("buildings", "building_hp", "villager_tasks",
+                "production_queue"):
+        if ys.get(key):
+            your_state[key] = ys[key]
+    your_state.update(_stable_block(
+        ys["age"], tuple(ys["upgrades"]),
+        ys["attack_bonus"], ys["armor_bonus"],
+    ))
+
+    return {
+        "turn": obs.turn,
+        "you": obs.you,
+        "your_state": your_state,
+        "enemy_units_by_zone": {
+            z: u for z, u in obs.enemy_units_by_zone.items() if u
+        },
+        "enemy_age": obs.enemy_age,
+        "enemy_town_center_hp": obs.enemy_town_center_hp,
+        "recent_events": obs.recent_events,
+    }
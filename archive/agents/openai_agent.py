@@ -2,11 +2,14 @@
 OpenAI GPT agent — uses response_format={"type":"json_object"} to enforce JSON.
 """
 from __future__ import annotations
-import json
 import os
+from collections import deque
+
+import orjson
 
 from agents.base import Agent
-from prompts.builder import SYSTEM_PROMPT
+from prompts.builder import Observation, get_system_prompt
+from agents.obs_compact import COMPACT_SCHEMA_NOTE, compact, json_default
 
 ACTION_SCHEMA_DESCRIPTION = """
 Respond with ONLY a JSON object (no markdown) with this exact schema:
@@ -36,38 +39,39 @@ class OpenAIAgent(Agent):
                 "Export it with: export OPENAI_API_KEY=sk-..."
             )
         try:
-            from openai import OpenAI
-            self._client = OpenAI(api_key=api_key)
+            from openai import AsyncOpenAI, OpenAIError
+            self._aclient = AsyncOpenAI(api_key=api_key)
+            self._OpenAIError = OpenAIError
         except ImportError:
             raise ImportError("openai package not installed. Run: pip install openai")
-        self._history: list[dict] = []
+        self._history: deque[dict] = deque(maxlen=20)
+        # Persona-static: format once instead of re-scanning the template per turn
+        self._system = (get_system_prompt(persona)
+                        + "\n\n" + ACTION_SCHEMA_DESCRIPTION
+                        + "\n" + COMPACT_SCHEMA_NOTE)
 
-    def get_action(self, observation: dict) -> dict:
-        from openai import OpenAIError
-        obs_text = json.dumps(observation, indent=2)
-        system = SYSTEM_PROMPT.format(persona=self.persona) + "\n\n" + ACTION_SCHEMA_DESCRIPTION
+    async def aget_action(self, observation: Observation) -> dict:
+        obs_text = orjson.dumps(compact(observation), default=json_default).decode()
         user_msg = (
             f"Current game state observation:\n```json\n{obs_text}\n```\n\n"
             "Output your action JSON now."
         )
         try:
-            response = self._client.chat.completions.create(
+            response = await self._aclient.chat.completions.create(
                 model=self.model_id,
                 max_tokens=1024,
                 response_format={"type": "json_object"},
                 messages=[
-                    {"role": "system", "content": system},
+                    {"role": "system", "content": self._system},
                     *self._history,
                     {"role": "user", "content": user_msg},
                 ],
             )
             content = response.choices[0].message.content or "{}"
-            action = json.loads(content)
+            action = orjson.loads(content)
             # Update rolling history
             self._history.append({"role": "user", "content": user_msg})
             self._history.append({"role": "assistant", "content": content})
-            if len(self._history) > 20:
-                self._history = self._history[-20:]
             return action
-        except (OpenAIError, json.JSONDecodeError) as e:
+        except (self._OpenAIError, orjson.JSONDecodeError) as e:
             raise RuntimeError(f"OpenAI API error: {e}") from e
@@ -1,10 +1,16 @@
 """
 Game constants: unit stats, costs, buildings, turn limits, zone names.
 """
+from sys import intern
+from types import MappingProxyType
 
 TURN_LIMIT = 50
 
-ZONES = ["Base_A", "Top_A", "Mid_A", "Bot_A", "Top_B", "Mid_B", "Bot_B", "Base_B"]
+# Zone/unit/building/upgrade names are interned so dict lookups against
+# JSON-parsed strings resolve by pointer identity once the validator has
+# interned its inputs to the same objects.
+ZONES = tuple(intern(z) for z in
+              ("Base_A", "Top_A", "Mid_A", "Bot_A", "Top_B", "Mid_B", "Bot_B", "Base_B"))
 
 ADJACENCY = {
     "Base_A": {"Top_A", "Mid_A", "Bot_A"},
@@ -16,6 +22,16 @@ ADJACENCY = {
     "Bot_B":  {"Bot_A", "Mid_B", "Base_B"},
     "Base_B": {"Top_B", "Mid_B", "Bot_B"},
 }
+# Neighbour sets never change after import; freezing lets readers share
+# them without defensive copies
+ADJACENCY = {z: frozenset(n) for z, n in ADJACENCY.items()}
+
+# Integer zone ids and adjacency packed into per-zone bitmasks: with only
+# 8 zones, `(ADJ_MASK[ZONE_ID[frm]] >> ZONE_ID[to]) & 1` replaces a set lookup.
+ZONE_ID = {z: i for i, z in enumerate(ZONES)}
+ADJ_MASK = tuple(
+    sum(1 << ZONE_ID[n] for n in ADJACENCY[z]) for z in ZONES
+)
 
 STARTING_RESOURCES = {"food": 200, "wood": 150, "gold": 50}
 
@@ -91,12 +107,34 @@ UNITS = {
     },
 }
 
+UNITS = {intern(k): v for k, v in UNITS.items()}
+
 # Infantry class (units that Archer counters)
 INFANTRY_TYPES = {"Villager", "Militia"}
 
 # Military unit types (not Villager)
 MILITARY_UNIT_TYPES = {"Militia", "Archer", "Knight", "Catapult"}
 
+# Integer-indexed stat tables for hot combat loops.
+# Unit ids follow UNITS insertion order; index the tuples with UNIT_IDS[name].
+UNIT_IDS = {name: i for i, name in enumerate(UNITS)}
+UNIT_NAMES = tuple(UNITS)
+UNIT_ATK = tuple(UNITS[n]["atk"] for n in UNIT_NAMES)
+UNIT_HP = tuple(UNITS[n]["hp"] for n in UNIT_NAMES)
+UNIT_COUNTER = tuple(UNITS[n]["counter"] for n in UNIT_NAMES)
+INFANTRY_MASK = tuple(n in INFANTRY_TYPES for n in UNIT_NAMES)
+
+# Costs flattened to (food, wood, gold) tuples in RESOURCE_ORDER, so hot
+# affordability checks unpack three ints instead of iterating cost dicts
+RESOURCE_ORDER = ("food", "wood", "gold")
+UNIT_COST_VEC = {
+    n: tuple(UNITS[n]["cost"].get(r, 0) for r in RESOURCE_ORDER) for n in UNITS
+}
+AGE_COST_VEC = {
+    age: tuple(cost.get(r, 0) for r in RESOURCE_ORDER)
+    for age, cost in AGE_ADVANCE_COSTS.items()
+}
+
 # Buildings
 BUILDINGS = {
     "Barracks": {
@@ -132,6 +170,8 @@ BUILDINGS = {
     },
 }
 
+BUILDINGS = {intern(k): v for k, v in BUILDINGS.items()}
+
 # Unit upgrades researched at Blacksmith
 UPGRADES = {
     "attack_1": {
@@ -168,6 +208,25 @@ UPGRADES = {
     },
 }
 
+UPGRADES = {intern(k): v for k, v in UPGRADES.items()}
+
+# Cost dicts pre-flattened to item tuples so hot deduction loops iterate
+# without constructing a fresh dict view per call
+for _defs in (UNITS, BUILDINGS, UPGRADES):
+    for _entry in _defs.values():
+        _entry["_cost_tuple"] = tuple(_entry["cost"].items())
+del _defs, _entry
+AGE_COST_ITEMS = {
+    age: tuple(cost.items()) for age, cost in AGE_ADVANCE_COSTS.items()
+}
+
+BUILDING_COST_VEC = {
+    n: tuple(BUILDINGS[n]["cost"].get(r, 0) for r in RESOURCE_ORDER) for n in BUILDINGS
+}
+UPGRADE_COST_VEC = {
+    n: tuple(UPGRADES[n]["cost"].get(r, 0) for r in RESOURCE_ORDER) for n in UPGRADES
+}
+
 # Unit value for scoring (score = resources + unit_value*2 + buildings*10)
 UNIT_VALUE = {
     "Villager": 25,
@@ -180,3 +239,10 @@ UNIT_VALUE = {
 BUILDING_VALUE = 10
 
 COUNTER_BONUS = 1.5
+
+# The core tables are import-time constants; read-only views make a
+# stray write fail fast instead of silently corrupting shared state
+UNITS = MappingProxyType(UNITS)
+BUILDINGS = MappingProxyType(BUILDINGS)
+UPGRADES = MappingProxyType(UPGRADES)
+ADJACENCY = MappingProxyType(ADJACENCY)
@@ -4,9 +4,10 @@ Rich-based terminal renderer: tables, panels, zone map, turn log.
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+import functools
 import sys
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.columns import Columns
 from rich.panel import Panel
 from rich.table import Table
@@ -81,7 +82,7 @@ def _player_panel(player, pid: str, color: str) -> Panel:
     buildings_parts = []
     for zone, blist in player.buildings.items():
         if blist:
-            zone_hp = player.building_hp.get(zone, {})
+            zone_hp = player.building_hp[zone]
             building_strs = []
             for b in blist:
                 if b in ("Wall", "Tower") and b in zone_hp:
@@ -125,20 +126,28 @@ def _player_panel(player, pid: str, color: str) -> Panel:
     )
 
     return Panel(
-        content + _renderable_table(unit_table),
+        Group(Text.from_markup(content), unit_table),
         title=f"[bold {color}]Player {pid} ({player.base_zone})[/bold {color}]",
         border_style=color,
     )
 
 
-def _renderable_table(table: Table) -> str:
-    """Render a Rich Table to string for embedding."""
-    from io import StringIO
-    from rich.console import Console as _Con
-    buf = StringIO()
-    c = _Con(file=buf, highlight=False, width=60)
-    c.print(table)
-    return buf.getvalue()
+@functools.lru_cache(maxsize=256)
+def _render_cell(a_units: tuple, b_units: tuple,
+                 a_bldgs: tuple, b_bldgs: tuple, name: str) -> str:
+    """Build the markup for one zone cell; cached since most zones change slowly."""
+    lines = [f"[bold]{name}[/bold]"]
+    if a_units:
+        lines.append("[cyan]A:" + " ".join(f"{v}{k[:3]}" for k, v in a_units) + "[/cyan]")
+    if a_bldgs:
+        lines.append(f"[dim]A:{','.join(b[:3] for b in a_bldgs)}[/dim]")
+    if b_units:
+        lines.append("[magenta]B:" + " ".join(f"{v}{k[:3]}" for k, v in b_units) + "[/magenta]")
+    if b_bldgs:
+        lines.append(f"[dim]B:{','.join(b[:3] for b in b_bldgs)}[/dim]")
+    if not a_units and not b_units and not a_bldgs and not b_bldgs:
+        lines.append("[dim](empty)[/dim]")
+    return "\n".join(lines)
 
 
 def _zone_map(gs: "GameState") -> Panel:
@@ -146,23 +155,12 @@ def _zone_map(gs: "GameState") -> Panel:
     pb = gs.players["B"]
 
     def cell(zone: str) -> str:
-        a_units = {k: v for k, v in pa.units.get(zone, {}).items() if v > 0}
-        b_units = {k: v for k, v in pb.units.get(zone, {}).items() if v > 0}
-        a_bldgs = pa.buildings.get(zone, [])
-        b_bldgs = pb.buildings.get(zone, [])
-        name = zone.replace("_", " ")
-        lines = [f"[bold]{name}[/bold]"]
-        if a_units:
-            lines.append("[cyan]A:" + " ".join(f"{v}{k[:3]}" for k, v in a_units.items()) + "[/cyan]")
-        if a_bldgs:
-            lines.append(f"[dim]A:{','.join(b[:3] for b in a_bldgs)}[/dim]")
-        if b_units:
-            lines.append("[magenta]B:" + " ".join(f"{v}{k[:3]}" for k, v in b_units.items()) + "[/magenta]")
-        if b_bldgs:
-            lines.append(f"[dim]B:{','.join(b[:3] for b in b_bldgs)}[/dim]")
-        if not a_units and not b_units and not a_bldgs and not b_bldgs:
-            lines.append("[dim](empty)[/dim]")
-        return "\n".join(lines)
+        # Zone keys always exist and buildings are already tuples
+        a_units = tuple(sorted(pa.units[zone].items()))
+        b_units = tuple(sorted(pb.units[zone].items()))
+        a_bldgs = pa.buildings[zone]
+        b_bldgs = pb.buildings[zone]
+        return _render_cell(a_units, b_units, a_bldgs, b_bldgs, zone.replace("_", " "))
 
     # 3-lane grid layout using a Table (4 cols, 3 rows)
     # col: Base_A | Top/Mid/Bot_A | Top/Mid/Bot_B | Base_B
@@ -179,14 +177,12 @@ def _zone_map(gs: "GameState") -> Panel:
     # Row 2: Bot lane
     grid.add_row("", cell("Bot_A"), cell("Bot_B"), "")
 
-    from io import StringIO
-    from rich.console import Console as _Con
-    buf = StringIO()
-    c = _Con(file=buf, highlight=False, width=80)
-    c.print(grid)
-    map_text = buf.getvalue()
-
-    map_text += "\n[dim]Top/Bot lanes connect across (Top_A↔Top_B, Bot_A↔Bot_B)[/dim]"
-    map_text += "\n[dim]Jungle: Top_A↔Mid_A, Bot_A↔Mid_A, Top_B↔Mid_B, Bot_B↔Mid_B[/dim]"
-
-    return Panel(map_text, title="[bold white]Zone Map (3-Lane)[/bold white]", border_style="white")
+    return Panel(
+        Group(
+            grid,
+            Text("Top/Bot lanes connect across (Top_A↔Top_B, Bot_A↔Bot_B)", style="dim"),
+            Text("Jungle: Top_A↔Mid_A, Bot_A↔Mid_A, Top_B↔Mid_B, Bot_B↔Mid_B", style="dim"),
+        ),
+        title="[bold white]Zone Map (3-Lane)[/bold white]",
+        border_style="white",
+    )
@@ -0,0 +1,78 @@
+"""
+Pure-numeric combat kernels, split out so they can be JIT-compiled.
+
+numba is an optional dependency: when installed, the kernels are compiled
+with @njit(cache=True) and interpreter overhead disappears; when absent
+they run as plain Python with identical results. Callers pass flat int
+arrays and stat tuples only — no dicts, strings, or game objects — and
+build log lines afterwards from the returned kill counts.
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def compute_damage(attackers, defenders, attack_bonus,
+                   unit_atk, counter_idx, infantry_mask, counter_bonus):
+    """Total damage dealt by attacker counts to defender counts.
+
+    counter_idx per attacker id: -2 = counters any infantry, -1 = no
+    field counter, >= 0 = the countered unit id.
+    """
+    n = len(attackers)
+    has_infantry = False
+    for i in range(n):
+        if infantry_mask[i] and defenders[i] > 0:
+            has_infantry = True
+            break
+    total = 0.0
+    for aid in range(n):
+        acount = attackers[aid]
+        if acount == 0:
+            continue
+        dmg = float((unit_atk[aid] + attack_bonus) * acount)
+        cid = counter_idx[aid]
+        if (cid == -2 and has_infantry) or (cid >= 0 and defenders[cid] > 0):
+            dmg *= counter_bonus
+        total += dmg
+    return total
+
+
+@njit(cache=True)
+def distribute_damage(counts, damage, armor_bonus, unit_hp, hp_order):
+    """Distribute damage over counts in hp_order; mutates counts in place.
+
+    Returns per-id kill counts so the caller can emit logs and update
+    kill/loss tallies.
+    """
+    kills = [0] * len(counts)
+    remaining = damage
+    for idx in range(len(hp_order)):
+        if remaining <= 0:
+            break
+        uid = hp_order[idx]
+        count = counts[uid]
+        if count == 0:
+            continue
+        hp = unit_hp[uid] + armor_bonus
+        killed = int(remaining // hp)
+        if killed > count:
+            killed = count
+        remaining -= killed * hp
+        # Partial kill on one more unit if damage remains
+        if remaining > 0 and killed < count:
+            killed += 1
+            remaining = 0.0
+        counts[uid] = count - killed
+        kills[uid] = killed
+    return kills
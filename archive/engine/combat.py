@@ -1,12 +1,35 @@
 """
 Deterministic combat resolution and counter system.
+
+Units in a zone are handled as fixed-width count arrays indexed by unit id
+(SoA layout) so damage math runs over flat integer arrays instead of dict
+iteration; dicts are only touched once at entry and write-back.
 """
 from __future__ import annotations
 from typing import Dict, List, Tuple
 
-from config import UNITS, INFANTRY_TYPES, COUNTER_BONUS, BUILDINGS
+from config import (
+    UNITS, COUNTER_BONUS, BUILDINGS, ZONE_ID,
+    UNIT_IDS, UNIT_NAMES, UNIT_ATK, UNIT_HP, UNIT_COUNTER, INFANTRY_MASK,
+)
+from engine._combat_kernel import compute_damage, distribute_damage
 from engine.state import GameState, PlayerState
 
+N_UNITS = len(UNIT_NAMES)
+
+# Unit ids in descending-HP order: damage is soaked by high-HP types first
+_HP_DESC_ORDER = tuple(sorted(range(N_UNITS), key=lambda i: UNIT_HP[i], reverse=True))
+
+# Per-attacker counter target id: -2 = counters any infantry, -1 = no field
+# counter, >= 0 = countered unit id. The Catapult's "Building" counter never
+# matches a field unit, so it maps to -1 here.
+_COUNTER_IDX = tuple(
+    -2 if c == "Infantry" else UNIT_IDS.get(c, -1) for c in UNIT_COUNTER
+)
+_INFANTRY_FLAGS = tuple(1 if m else 0 for m in INFANTRY_MASK)
+
+_VILLAGER_ID = UNIT_IDS["Villager"]
+
 
 def resolve_combat(gs: GameState, zone: str) -> None:
     """
@@ -17,109 +40,102 @@ def resolve_combat(gs: GameState, zone: str) -> None:
     pa = gs.players["A"]
     pb = gs.players["B"]
 
-    # Apply tower damage before field combat
-    _apply_tower_damage(gs, zone, pa, pb)
+    # Early exit on the common empty-zone path: nothing can happen unless
+    # both sides are present (units or a tower) or the zone is a base.
+    a_zone = pa.units[zone]
+    b_zone = pb.units[zone]
+    a_has = any(a_zone.values()) or "Tower" in pa.buildings[zone]
+    b_has = any(b_zone.values()) or "Tower" in pb.buildings[zone]
+    if not (a_has and b_has) and zone != pa.base_zone and zone != pb.base_zone:
+        return
 
-    # Refresh unit dicts after tower damage
-    units_a = {k: v for k, v in pa.units.get(zone, {}).items() if v > 0}
-    units_b = {k: v for k, v in pb.units.get(zone, {}).items() if v > 0}
+    counts_a = _to_counts(a_zone)
+    counts_b = _to_counts(b_zone)
 
-    if not units_a or not units_b:
+    # Apply tower damage before field combat
+    _apply_tower_damage(gs, zone, pa, pb, counts_a, counts_b)
+
+    if not any(counts_a) or not any(counts_b):
         # No field combat if only one side present
-        _handle_base_attack(gs, zone, pa, pb, units_a, units_b)
+        _handle_base_attack(gs, zone, pa, pb, counts_a, counts_b)
         return
 
-    gs.add_log(f"Combat in {zone}: A={_fmt(units_a)} vs B={_fmt(units_b)}")
+    gs.add_log(f"Combat in {zone}: A={_fmt(counts_a)} vs B={_fmt(counts_b)}")
 
     # Both sides deal damage simultaneously
-    dmg_to_b = _compute_total_damage(units_a, units_b, pa.attack_bonus)
-    dmg_to_a = _compute_total_damage(units_b, units_a, pb.attack_bonus)
+    dmg_to_b = _compute_total_damage(counts_a, counts_b, pa.attack_bonus)
+    dmg_to_a = _compute_total_damage(counts_b, counts_a, pb.attack_bonus)
 
-    _apply_damage(pa, zone, units_a, dmg_to_a, gs, pa.armor_bonus)
-    _apply_damage(pb, zone, units_b, dmg_to_b, gs, pb.armor_bonus)
+    _apply_damage(pa, zone, counts_a, dmg_to_a, gs, pa.armor_bonus)
+    _apply_damage(pb, zone, counts_b, dmg_to_b, gs, pb.armor_bonus)
 
     # Catapult TC damage if attacking enemy base
-    _handle_base_attack(gs, zone, pa, pb,
-                        {k: v for k, v in pa.units.get(zone, {}).items() if v > 0},
-                        {k: v for k, v in pb.units.get(zone, {}).items() if v > 0})
+    _handle_base_attack(gs, zone, pa, pb, counts_a, counts_b)
+
+
+def _to_counts(units: Dict[str, int]) -> List[int]:
+    """Zone unit dict -> fixed-width count array indexed by unit id."""
+    counts = [0] * N_UNITS
+    for utype, cnt in units.items():
+        if cnt > 0:
+            counts[UNIT_IDS[utype]] = cnt
+    return counts
 
 
-def _apply_tower_damage(gs: GameState, zone: str, pa: PlayerState, pb: PlayerState) -> None:
+def _to_dict(counts: List[int]) -> Dict[str, int]:
+    """Count array -> {unit_type: count} with positive entries only."""
+    return {UNIT_NAMES[i]: c for i, c in enumerate(counts) if c > 0}
+
+
+def _apply_tower_damage(gs: GameState, zone: str, pa: PlayerState, pb: PlayerState,
+                        counts_a: List[int], counts_b: List[int]) -> None:
     """Towers in a zone fire at enemy units before field combat."""
     # A's towers fire at B's units in the same zone
-    a_towers = pa.buildings.get(zone, []).count("Tower")
-    if a_towers > 0:
-        b_units = {k: v for k, v in pb.units.get(zone, {}).items() if v > 0}
-        if b_units:
-            tower_dmg = a_towers * BUILDINGS["Tower"]["damage_per_turn"]
-            gs.add_log(f"  A's {a_towers} Tower(s) in {zone} fire {tower_dmg} dmg at B's units")
-            _apply_damage(pb, zone, b_units, float(tower_dmg), gs, pb.armor_bonus)
+    a_towers = pa.buildings[zone].count("Tower")
+    if a_towers > 0 and any(counts_b):
+        tower_dmg = a_towers * BUILDINGS["Tower"]["damage_per_turn"]
+        gs.add_log(f"  A's {a_towers} Tower(s) in {zone} fire {tower_dmg} dmg at B's units")
+        _apply_damage(pb, zone, counts_b, float(tower_dmg), gs, pb.armor_bonus)
 
     # B's towers fire at A's units in the same zone
-    b_towers = pb.buildings.get(zone, []).count("Tower")
-    if b_towers > 0:
-        a_units = {k: v for k, v in pa.units.get(zone, {}).items() if v > 0}
-        if a_units:
-            tower_dmg = b_towers * BUILDINGS["Tower"]["damage_per_turn"]
-            gs.add_log(f"  B's {b_towers} Tower(s) in {zone} fire {tower_dmg} dmg at A's units")
-            _apply_damage(pa, zone, a_units, float(tower_dmg), gs, pa.armor_bonus)
+    b_towers = pb.buildings[zone].count("Tower")
+    if b_towers > 0 and any(counts_a):
+        tower_dmg = b_towers * BUILDINGS["Tower"]["damage_per_turn"]
+        gs.add_log(f"  B's {b_towers} Tower(s) in {zone} fire {tower_dmg} dmg at A's units")
+        _apply_damage(pa, zone, counts_a, float(tower_dmg), gs, pa.armor_bonus)
 
 
-def _compute_total_damage(attackers: Dict[str, int], defenders: Dict[str, int],
+def _compute_total_damage(attackers: List[int], defenders: List[int],
                           attack_bonus: int = 0) -> float:
-    """Return total damage dealt by attackers to defenders."""
-    total = 0.0
-    for atype, acount in attackers.items():
-        base_atk = UNITS[atype]["atk"] + attack_bonus
-        base_dmg = base_atk * acount
-        counter = UNITS[atype]["counter"]
-        bonus = 1.0
-        if counter == "Infantry":
-            # Archer counters infantry
-            for dtype in defenders:
-                if dtype in INFANTRY_TYPES:
-                    bonus = COUNTER_BONUS
-                    break
-        elif counter is not None:
-            # Knight counters Archer, etc.
-            if counter in defenders:
-                bonus = COUNTER_BONUS
-        total += base_dmg * bonus
-    return total
+    """Return total damage dealt by attacker counts to defender counts."""
+    return compute_damage(attackers, defenders, attack_bonus,
+                          UNIT_ATK, _COUNTER_IDX, _INFANTRY_FLAGS, COUNTER_BONUS)
 
 
 def _apply_damage(player: PlayerState, zone: str,
-                  current_units: Dict[str, int],
-                  damage: float, gs: GameState,
+                  counts: List[int], damage: float, gs: GameState,
                   armor_bonus: int = 0) -> None:
-    """Distribute damage to units in descending HP order until exhausted."""
-    remaining = damage
-    # Sort unit types by HP descending (tank high-HP units first)
-    sorted_types = sorted(current_units.keys(),
-                          key=lambda u: UNITS[u]["hp"], reverse=True)
-    for utype in sorted_types:
-        if remaining <= 0:
-            break
-        count = current_units[utype]
-        unit_hp = UNITS[utype]["hp"] + armor_bonus
-        # How many full kills?
-        kills = min(count, int(remaining // unit_hp))
-        remaining -= kills * unit_hp
-        # Partial kill on one more unit if damage remains
-        if remaining > 0 and kills < count:
-            kills += 1
-            remaining = 0
-        actual_kills = min(kills, count)
-        current_units[utype] = count - actual_kills
-        if actual_kills:
-            gs.add_log(f"  P{player.player_id} lost {actual_kills}×{utype} in {zone}")
-            player.units_lost += actual_kills
-            opponent_pid = "B" if player.player_id == "A" else "A"
-            gs.players[opponent_pid].units_killed += actual_kills
-
-    # Write back
-    for utype, cnt in current_units.items():
-        player.units[zone][utype] = cnt
+    """Distribute damage to unit counts in descending HP order until exhausted."""
+    kills = distribute_damage(counts, damage, armor_bonus, UNIT_HP, _HP_DESC_ORDER)
+    zone_units = player.units[zone]
+    opponent = gs.players["B" if player.player_id == "A" else "A"]
+    for uid in _HP_DESC_ORDER:
+        killed = kills[uid]
+        if not killed:
+            continue
+        # Keep the delete-on-zero invariant: no lingering zero entries
+        if counts[uid]:
+            zone_units[UNIT_NAMES[uid]] = counts[uid]
+        else:
+            zone_units.pop(UNIT_NAMES[uid], None)
+        if uid == _VILLAGER_ID:
+            player.total_villagers -= killed
+        player._score_dirty = True
+        gs.add_log(f"  P{player.player_id} lost {killed}×{UNIT_NAMES[uid]} in {zone}")
+        player.units_lost += killed
+        opponent.units_killed += killed
+    if not any(counts):
+        player.occupied_mask &= ~(1 << ZONE_ID[zone])
 
 
 def _base_attack(gs: GameState, attacker_units: Dict[str, int],
@@ -131,15 +147,21 @@ def _base_attack(gs: GameState, attacker_units: Dict[str, int],
         return
 
     # Wall absorption: damage hits Wall HP first
-    wall_hp = defender.building_hp.get(zone, {}).get("Wall", 0)
+    wall_hp = defender.building_hp[zone].get("Wall", 0)
     if wall_hp > 0:
         absorbed = min(dmg, wall_hp)
         dmg -= absorbed
         wall_hp -= absorbed
         if wall_hp <= 0:
             defender.building_hp[zone]["Wall"] = 0
-            if "Wall" in defender.buildings.get(zone, []):
-                defender.buildings[zone].remove("Wall")
+            blist = defender.buildings[zone]
+            if "Wall" in blist:
+                # Rebuild the tuple minus the first Wall; never mutate
+                idx = blist.index("Wall")
+                defender.buildings[zone] = blist[:idx] + blist[idx + 1:]
+                if defender.buildings_any.get("Wall", 0) > 0:
+                    defender.buildings_any["Wall"] -= 1
+                defender._score_dirty = True
             gs.add_log(f"  {attacker_pid}'s forces destroyed P{defender.player_id}'s Wall in {zone}!")
         else:
             defender.building_hp[zone]["Wall"] = wall_hp
@@ -156,17 +178,18 @@ def _base_attack(gs: GameState, attacker_units: Dict[str, int],
 
 def _handle_base_attack(gs: GameState, zone: str,
                         pa: PlayerState, pb: PlayerState,
-                        units_a: Dict[str, int], units_b: Dict[str, int]) -> None:
+                        counts_a: List[int], counts_b: List[int]) -> None:
     """
     Any units in an undefended enemy base zone attack the Town Center.
+    Unit dicts are only materialised for the zone that actually attacks.
     """
     # A's units in B's base with no defenders
-    if zone == pb.base_zone and units_a and not units_b:
-        _base_attack(gs, units_a, "A", pb, zone)
+    if zone == pb.base_zone and any(counts_a) and not any(counts_b):
+        _base_attack(gs, _to_dict(counts_a), "A", pb, zone)
     # B's units in A's base with no defenders
-    if zone == pa.base_zone and units_b and not units_a:
-        _base_attack(gs, units_b, "B", pa, zone)
+    if zone == pa.base_zone and any(counts_b) and not any(counts_a):
+        _base_attack(gs, _to_dict(counts_b), "B", pa, zone)
 
 
-def _fmt(units: Dict[str, int]) -> str:
-    return ", ".join(f"{v}x{k}" for k, v in units.items() if v)
+def _fmt(counts: List[int]) -> str:
+    return ", ".join(f"{c}x{UNIT_NAMES[i]}" for i, c in enumerate(counts) if c)
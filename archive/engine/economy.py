@@ -1,8 +1,10 @@
 """
 Economy tick: income from villagers, passive gold, production queue decrement.
 """
-from config import VILLAGER_TASK_RATES, VILLAGER_IDLE_RATES, GOLD_TRICKLE
-from engine.state import GameState, PlayerState, ProductionItem
+from collections import Counter
+
+from config import VILLAGER_TASK_RATES, VILLAGER_IDLE_RATES, GOLD_TRICKLE, ZONE_ID
+from engine.state import GameState, PlayerState
 
 
 def economy_tick(gs: GameState) -> None:
@@ -13,11 +15,8 @@ def economy_tick(gs: GameState) -> None:
 
 
 def _apply_income(player: PlayerState, gs: GameState) -> None:
-    # Count total villagers across all zones
-    total_villagers = sum(
-        zone_units.get("Villager", 0)
-        for zone_units in player.units.values()
-    )
+    # Maintained incrementally on graduation and combat loss
+    total_villagers = player.total_villagers
 
     # Read villager tasks; safety-scale if villagers died since last task update
     tasks = dict(player.villager_tasks)
@@ -45,9 +44,9 @@ def _apply_income(player: PlayerState, gs: GameState) -> None:
     # Passive gold trickle always applies
     gold_gain += GOLD_TRICKLE
 
-    player.resources["food"] = player.resources.get("food", 0) + food_gain
-    player.resources["wood"] = player.resources.get("wood", 0) + wood_gain
-    player.resources["gold"] = player.resources.get("gold", 0) + gold_gain
+    player.resources["food"] += food_gain
+    player.resources["wood"] += wood_gain
+    player.resources["gold"] += gold_gain
 
     gs.add_log(
         f"P{player.player_id} income: +{food_gain}f +{wood_gain}w +{gold_gain}g "
@@ -56,15 +55,27 @@ def _apply_income(player: PlayerState, gs: GameState) -> None:
 
 
 def _decrement_queue(player: PlayerState, gs: GameState) -> None:
-    """Decrement production queue; graduate finished units to home base."""
-    still_training: list[ProductionItem] = []
-    for item in player.production_queue:
+    """Decrement production queue; graduate finished units to home base.
+
+    The queue is kept sorted by turns_left, so after a uniform decrement
+    every finished item sits at the front and pops off in O(1) — no
+    rebuilt list per tick.
+    """
+    queue = player.production_queue
+    for item in queue:
         item.turns_left -= 1
-        if item.turns_left <= 0:
-            # Graduate unit to home base
-            zone_units = player.units.setdefault(player.base_zone, {})
-            zone_units[item.unit_type] = zone_units.get(item.unit_type, 0) + 1
-            gs.add_log(f"P{player.player_id} trained {item.unit_type} → {player.base_zone}")
-        else:
-            still_training.append(item)
-    player.production_queue = still_training
+    if not (queue and queue[0].turns_left <= 0):
+        return
+    # Aggregate finished items per type: one dict write and one log line
+    # per unit type rather than per unit
+    finished: Counter = Counter()
+    while queue and queue[0].turns_left <= 0:
+        finished[queue.popleft().unit_type] += 1
+    zone_units = player.units[player.base_zone]
+    for unit_type, count in finished.items():
+        zone_units[unit_type] = zone_units.get(unit_type, 0) + count
+        if unit_type == "Villager":
+            player.total_villagers += count
+        gs.add_log(f"P{player.player_id} trained {count}×{unit_type} → {player.base_zone}")
+    player.occupied_mask |= 1 << ZONE_ID[player.base_zone]
+    player._score_dirty = True
@@ -3,15 +3,21 @@ Orchestrates one full turn: economy → validate → move → combat → victory
 """
 from __future__ import annotations
 import asyncio
-import json
 import os
+from bisect import insort_right
 from typing import Dict, Optional, Tuple
 
-from config import TURN_LIMIT, ZONES, UNITS, BUILDINGS, AGE_ADVANCE_COSTS, UPGRADES
+import orjson
+
+from config import (
+    TURN_LIMIT, ZONES, ZONE_ID, UNITS, BUILDINGS, AGE_COST_ITEMS, AGE_NAMES,
+    UPGRADES, RESOURCE_ORDER, UNIT_COST_VEC,
+)
 from engine.state import GameState, ProductionItem
 from engine.economy import economy_tick
 from engine.combat import resolve_combat
-from engine.validator import validate_action, deduct_costs
+from engine.validator import validate_action, deduct_costs, _can_afford, _max_affordable
+from prompts.builder import Observation, build_observation, snapshot_units
 
 
 async def run_turn(
@@ -27,17 +33,24 @@ async def run_turn(
     # 1. Economy tick (uses villager_tasks from previous turn)
     economy_tick(gs)
 
-    # 2. Build observations
-    from prompts.builder import build_observation
-    obs_a = build_observation(gs, "A")
-    obs_b = build_observation(gs, "B")
-
-    # 3. Parallel API calls
-    raw_a, raw_b = await asyncio.gather(
-        _get_agent_action(agents["A"], obs_a, "A", gs),
-        _get_agent_action(agents["B"], obs_b, "B", gs),
+    # 2. Build observations. Both walks are read-only on gs, so they run
+    # in worker threads side by side (and off the event loop) rather than
+    # back to back on it. The unit snapshot is taken once and shared —
+    # each player's zone dicts are copied a single time per turn.
+    units_snapshot = snapshot_units(gs)
+    obs_a, obs_b = await asyncio.gather(
+        asyncio.to_thread(build_observation, gs, "A", units_snapshot),
+        asyncio.to_thread(build_observation, gs, "B", units_snapshot),
     )
 
+    # 3. Parallel API calls. TaskGroup gives structured cancellation: if the
+    # turn is cancelled mid-flight, both agent tasks are cancelled rather
+    # than leaking an in-flight LLM call the way gather() would.
+    async with asyncio.TaskGroup() as tg:
+        task_a = tg.create_task(_get_agent_action(agents["A"], obs_a, "A", gs))
+        task_b = tg.create_task(_get_agent_action(agents["B"], obs_b, "B", gs))
+    raw_a, raw_b = task_a.result(), task_b.result()
+
     # 4. Validate actions
     action_a = validate_action(raw_a, gs.players["A"], gs.turn)
     action_b = validate_action(raw_b, gs.players["B"], gs.turn)
@@ -45,25 +58,12 @@ async def run_turn(
     gs.add_log(f"A actions: train={action_a['train']} build={action_a['build']} move={action_a['move']}")
     gs.add_log(f"B actions: train={action_b['train']} build={action_b['build']} move={action_b['move']}")
 
-    # 5a. Process age advances
-    _process_advance_age(gs, "A", action_a)
-    _process_advance_age(gs, "B", action_b)
-
-    # 5b. Process villager tasks
-    _process_task_villagers(gs, "A", action_a)
-    _process_task_villagers(gs, "B", action_b)
-
-    # 5c. Process research
-    _process_research(gs, "A", action_a)
-    _process_research(gs, "B", action_b)
-
-    # 5d. Process builds
-    _process_builds(gs, "A", action_a)
-    _process_builds(gs, "B", action_b)
-
-    # 5e. Process trains (deducts costs internally)
-    _process_trains(gs, "A", action_a)
-    _process_trains(gs, "B", action_b)
+    # 5. Run the per-player action pipeline (age → tasks → research →
+    # builds → trains). No phase reads the other player's state, so one
+    # fused pass per player is equivalent to five phase-by-phase sweeps.
+    for pid, action in (("A", action_a), ("B", action_b)):
+        for handler in _PIPELINE:
+            handler(gs, pid, action)
 
     # 6. Deduct costs (builds only — train costs already done)
     deduct_costs(action_a, gs.players["A"])
@@ -85,17 +85,17 @@ async def run_turn(
         renderer.render(gs)
 
     if log_dir:
-        _save_turn_log(gs, log_dir)
+        _schedule_turn_log(gs, log_dir)
 
     gs.turn += 1
     return winner
 
 
-async def _get_agent_action(agent, observation: dict, pid: str, gs: GameState) -> dict:
+async def _get_agent_action(agent, observation: Observation, pid: str, gs: GameState) -> dict:
     """Call agent with timeout/error handling."""
     try:
         result = await asyncio.wait_for(
-            asyncio.to_thread(agent.get_action, observation),
+            agent.aget_action(observation),
             timeout=60.0,
         )
         return result if isinstance(result, dict) else {}
@@ -107,19 +107,24 @@ async def _get_agent_action(agent, observation: dict, pid: str, gs: GameState) -
         return {}
 
 
-def _process_advance_age(gs: GameState, pid: str, action: dict) -> None:
+# The _process_* handlers bind their config tables as default-argument
+# locals: LOAD_FAST in the per-action loops instead of a module-global
+# lookup per access.
+def _process_advance_age(gs: GameState, pid: str, action: dict,
+                         _AGE_COST_ITEMS=AGE_COST_ITEMS) -> None:
     if not action.get("advance_age"):
         return
     player = gs.players[pid]
     next_age = player.age + 1
-    cost = AGE_ADVANCE_COSTS.get(next_age, {})
-    if not all(player.resources.get(r, 0) >= cost.get(r, 0) for r in cost):
+    cost = _AGE_COST_ITEMS.get(next_age, ())
+    resources = player.resources
+    if not all(resources[r] >= amount for r, amount in cost):
         return
-    for res, amount in cost.items():
-        player.resources[res] = player.resources.get(res, 0) - amount
+    for res, amount in cost:
+        resources[res] -= amount
         player.resources_banked += amount
+    player._score_dirty = True
     player.age = next_age
-    from config import AGE_NAMES
     gs.add_log(f"P{pid} advanced to Age {next_age} ({AGE_NAMES[next_age]})")
 
 
@@ -132,60 +137,92 @@ def _process_task_villagers(gs: GameState, pid: str, action: dict) -> None:
     gs.add_log(f"P{pid} tasked villagers: {tasks}")
 
 
-def _process_research(gs: GameState, pid: str, action: dict) -> None:
+def _process_research(gs: GameState, pid: str, action: dict,
+                      _UPGRADES=UPGRADES) -> None:
     player = gs.players[pid]
+    resources = player.resources
     for item in action.get("research", []):
         upgrade_name = item.get("upgrade")
-        if upgrade_name not in UPGRADES:
+        if upgrade_name not in _UPGRADES:
             continue
         if upgrade_name in player.upgrades:
             continue
-        upg = UPGRADES[upgrade_name]
-        cost = upg["cost"]
-        if not all(player.resources.get(r, 0) >= cost.get(r, 0) for r in cost):
+        upg = _UPGRADES[upgrade_name]
+        cost = upg["_cost_tuple"]
+        if not all(resources[r] >= amount for r, amount in cost):
             continue
-        for res, amount in cost.items():
-            player.resources[res] = player.resources.get(res, 0) - amount
+        for res, amount in cost:
+            resources[res] -= amount
             player.resources_banked += amount
+        player._score_dirty = True
         player.upgrades.append(upgrade_name)
         player.attack_bonus += upg.get("attack_bonus", 0)
         player.armor_bonus += upg.get("armor_bonus", 0)
         gs.add_log(f"P{pid} researched {upgrade_name} (+{upg.get('attack_bonus',0)} atk, +{upg.get('armor_bonus',0)} armor)")
 
 
-def _process_builds(gs: GameState, pid: str, action: dict) -> None:
+def _process_builds(gs: GameState, pid: str, action: dict,
+                    _BUILDINGS=BUILDINGS) -> None:
     player = gs.players[pid]
+    resources = player.resources
     for item in action.get("build", []):
         building = item["building"]
-        cost = BUILDINGS[building]["cost"]
-        if not all(player.resources.get(r, 0) >= cost.get(r, 0) for r in cost):
+        cost = _BUILDINGS[building]["_cost_tuple"]
+        if not all(resources[r] >= amount for r, amount in cost):
             continue
-        player.buildings[player.base_zone].append(building)
+        # Tuples are rebuilt, never mutated, so observation readers alias
+        base = player.base_zone
+        player.buildings[base] = player.buildings[base] + (building,)
+        player.buildings_any[building] = player.buildings_any.get(building, 0) + 1
+        player._score_dirty = True
         # Track HP for Wall and Tower
         if building in ("Wall", "Tower"):
-            zone_hp = player.building_hp.setdefault(player.base_zone, {})
-            zone_hp[building] = zone_hp.get(building, 0) + BUILDINGS[building]["hp"]
+            zone_hp = player.building_hp[player.base_zone]
+            zone_hp[building] = zone_hp.get(building, 0) + _BUILDINGS[building]["hp"]
         gs.add_log(f"P{pid} built {building} in {player.base_zone}")
 
 
-def _process_trains(gs: GameState, pid: str, action: dict) -> None:
+def _process_trains(gs: GameState, pid: str, action: dict,
+                    _UNITS=UNITS, _UNIT_COST_VEC=UNIT_COST_VEC,
+                    _ProductionItem=ProductionItem) -> None:
     player = gs.players[pid]
+    resources = player.resources
     for item in action.get("train", []):
         unit = item["unit"]
         count = item["count"]
-        turns = UNITS[unit]["train_turns"]
-        cost = UNITS[unit]["cost"]
-        # Deduct per unit and add to queue
-        for _ in range(count):
-            if not all(player.resources.get(r, 0) >= cost.get(r, 0) for r in cost):
-                break
-            for res, amount in cost.items():
-                player.resources[res] = player.resources.get(res, 0) - amount
-                player.resources_banked += amount
-            player.production_queue.append(ProductionItem(unit, turns))
+        turns = _UNITS[unit]["train_turns"]
+        cost_vec = _UNIT_COST_VEC[unit]
+        # Deduct once for the whole affordable batch instead of per unit.
+        # The _can_afford gate also rejects training while any resource is
+        # negative (build costs deduct after trains), matching the old
+        # per-unit check.
+        affordable = (_max_affordable(resources, cost_vec, count)
+                      if _can_afford(resources, cost_vec) else 0)
+        for res, amount in zip(RESOURCE_ORDER, cost_vec):
+            if amount:
+                total = amount * affordable
+                resources[res] -= total
+                player.resources_banked += total
+        if affordable:
+            player._score_dirty = True
+        for _ in range(affordable):
+            # Keep the queue sorted by turns_left for O(1) graduation popleft
+            insort_right(player.production_queue, _ProductionItem(unit, turns),
+                         key=lambda p: p.turns_left)
         gs.add_log(f"P{pid} queued {count}×{unit} ({turns} turn(s) each)")
 
 
+# Phase order within a turn; moves stay outside because build costs must
+# deduct (step 6) before units relocate
+_PIPELINE = (
+    _process_advance_age,
+    _process_task_villagers,
+    _process_research,
+    _process_builds,
+    _process_trains,
+)
+
+
 def _process_moves(gs: GameState, pid: str, action: dict) -> None:
     player = gs.players[pid]
     for item in action.get("move", []):
@@ -193,13 +230,23 @@ def _process_moves(gs: GameState, pid: str, action: dict) -> None:
         count = item["count"]
         from_zone = item["from"]
         to_zone = item["to"]
-        available = player.units.get(from_zone, {}).get(unit, 0)
+        # Every zone key exists from __post_init__, so index directly
+        from_units = player.units[from_zone]
+        available = from_units.get(unit, 0)
         actual = min(count, available)
         if actual < 1:
             continue
-        player.units[from_zone][unit] = available - actual
-        to_units = player.units.setdefault(to_zone, {})
+        # Zero counts are deleted, not stored: readers (observations,
+        # serialization) can copy zone dicts without filtering
+        if actual == available:
+            del from_units[unit]
+        else:
+            from_units[unit] = available - actual
+        to_units = player.units[to_zone]
         to_units[unit] = to_units.get(unit, 0) + actual
+        player.occupied_mask |= 1 << ZONE_ID[to_zone]
+        if not from_units:
+            player.occupied_mask &= ~(1 << ZONE_ID[from_zone])
         gs.add_log(f"P{pid} moved {actual}×{unit}: {from_zone}→{to_zone}")
 
 
@@ -238,8 +285,59 @@ def _check_victory(gs: GameState) -> Optional[str]:
     return None
 
 
-def _save_turn_log(gs: GameState, log_dir: str) -> None:
+# In-flight background log writes; bounded by _save_sem so a slow disk
+# can't queue unbounded encode work
+_pending_saves: list = []
+_save_sem: Optional[asyncio.Semaphore] = None
+
+
+def _schedule_turn_log(gs: GameState, log_dir: str) -> None:
+    """Snapshot this turn's delta and hand the encode+write to a thread.
+
+    Replaying the whole log every turn made total log IO quadratic in game
+    length; the cursor keeps each file at one turn's worth of lines. The
+    complete state (including the retained log) goes in the final snapshot.
+    The payload dict is built here, before the next turn mutates state; only
+    the orjson encode and the blocking file write leave the event loop.
+    """
     os.makedirs(log_dir, exist_ok=True)
+    new_lines = gs.recent_log(gs._log_total - gs._log_cursor)
+    gs._log_cursor = gs._log_total
+    payload = {
+        "turn": gs.turn,
+        "players": {pid: p.to_dict() for pid, p in gs.players.items()},
+        "log": new_lines,
+        "winner": gs.winner,
+    }
     path = os.path.join(log_dir, f"turn_{gs.turn:03d}.json")
-    with open(path, "w") as f:
-        json.dump(gs.to_dict(), f, indent=2)
+    _pending_saves.append(asyncio.create_task(_write_turn_log(payload, path)))
+
+
+async def _write_turn_log(payload: dict, path: str) -> None:
+    global _save_sem
+    if _save_sem is None:
+        _save_sem = asyncio.Semaphore(4)
+    async with _save_sem:
+        await asyncio.to_thread(_write_json, path, payload)
+
+
+def _write_json(path: str, payload: dict) -> None:
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+
+
+async def flush_turn_logs() -> None:
+    """Await all in-flight turn-log writes (call once at end of game)."""
+    global _save_sem
+    if _pending_saves:
+        await asyncio.gather(*_pending_saves)
+        _pending_saves.clear()
+    _save_sem = None
+
+
+def save_final_snapshot(gs: GameState, log_dir: str) -> None:
+    """Write the complete end-of-game state once, pretty-printed."""
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, "game_final.json")
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(gs.to_dict(), option=orjson.OPT_INDENT_2))
@@ -2,14 +2,15 @@
 GameState, PlayerState, Unit dataclasses — JSON-serialisable.
 """
 from __future__ import annotations
-import copy
+from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
-from config import ZONES, STARTING_RESOURCES, TOWN_CENTER_HP, UNITS
+from config import ZONES, ZONE_ID, STARTING_RESOURCES, TOWN_CENTER_HP, UNITS
 
 
-@dataclass
+@dataclass(slots=True)
 class ProductionItem:
     unit_type: str
     turns_left: int
@@ -18,17 +19,19 @@ class ProductionItem:
         return {"unit_type": self.unit_type, "turns_left": self.turns_left}
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerState:
     player_id: str          # "A" or "B"
     base_zone: str          # "Base_A" or "Base_B"
     resources: Dict[str, int] = field(default_factory=lambda: dict(STARTING_RESOURCES))
     # units[zone][unit_type] = count
     units: Dict[str, Dict[str, int]] = field(default_factory=dict)
-    # buildings[zone] = list of building names
-    buildings: Dict[str, List[str]] = field(default_factory=dict)
+    # buildings[zone] = tuple of building names; rebuilt on add/destroy
+    # so readers (observations, serializers) can alias without copying
+    buildings: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
     town_center_hp: int = TOWN_CENTER_HP
-    production_queue: List[ProductionItem] = field(default_factory=list)
+    # Kept sorted by turns_left (insort on train) so finished items pop left
+    production_queue: Deque[ProductionItem] = field(default_factory=deque)
     resources_banked: int = 0   # cumulative resources ever spent (for scoring)
     # New fields
     age: int = 1
@@ -39,31 +42,54 @@ class PlayerState:
     armor_bonus: int = 0
     units_killed: int = 0   # cumulative enemy units this player has killed
     units_lost: int = 0     # cumulative own units this player has lost
+    # Running villager count across all zones, maintained incrementally on
+    # graduation and combat loss so the economy tick never re-sums zones
+    total_villagers: int = 0
+    # Building counts across all zones (counts, not a set, because Walls
+    # can be destroyed in combat) so prereq checks avoid a zone scan
+    buildings_any: Dict[str, int] = field(default_factory=dict)
+    # Bitmask over ZONE_ID of zones where this player has at least one
+    # unit, maintained at the mutation sites (graduation, moves, combat)
+    # so the per-turn observation build never rescans every zone dict.
+    # Same encoding as config.ADJ_MASK.
+    occupied_mask: int = 0
+    # score() memo, recomputed only after a score-relevant mutation
+    _score_cache: int = 0
+    _score_dirty: bool = True
 
     def __post_init__(self):
+        # Guarantee all resource keys exist so hot paths can index directly
+        for res in ("food", "wood", "gold"):
+            self.resources.setdefault(res, 0)
         for zone in ZONES:
             if zone not in self.units:
                 self.units[zone] = {}
             if zone not in self.buildings:
-                self.buildings[zone] = []
+                self.buildings[zone] = ()
             if zone not in self.building_hp:
                 self.building_hp[zone] = {}
         # Start with 3 Villagers in home base
         self.units[self.base_zone]["Villager"] = 3
+        self.total_villagers = 3
+        self.occupied_mask = 1 << ZONE_ID[self.base_zone]
 
     def unit_count(self, zone: str, unit_type: str) -> int:
-        return self.units.get(zone, {}).get(unit_type, 0)
+        return self.units[zone].get(unit_type, 0)
 
     def total_units_in_zone(self, zone: str) -> Dict[str, int]:
-        return {k: v for k, v in self.units.get(zone, {}).items() if v > 0}
+        # Zero counts are deleted at mutation sites, so no filter needed
+        return dict(self.units[zone])
 
     def has_building(self, zone: str, building: str) -> bool:
-        return building in self.buildings.get(zone, [])
+        # Every zone key exists from __post_init__, so index directly
+        return building in self.buildings[zone]
 
     def any_building(self, building: str) -> bool:
-        return any(building in blist for blist in self.buildings.values())
+        return self.buildings_any.get(building, 0) > 0
 
     def score(self) -> int:
+        if not self._score_dirty:
+            return self._score_cache
         from config import UNIT_VALUE, BUILDING_VALUE
         unit_score = sum(
             UNIT_VALUE.get(ut, 0) * count
@@ -74,7 +100,42 @@ class PlayerState:
             len(blist) * BUILDING_VALUE
             for blist in self.buildings.values()
         )
-        return self.resources_banked + unit_score * 2 + building_score
+        self._score_cache = self.resources_banked + unit_score * 2 + building_score
+        self._score_dirty = False
+        return self._score_cache
+
+    def clone(self) -> "PlayerState":
+        """Hand-rolled copy of the mutable leaves only.
+
+        Much faster than copy.deepcopy, which reflectively walks every
+        container through the generic pickle machinery.
+        """
+        new = PlayerState.__new__(PlayerState)
+        new.player_id = self.player_id
+        new.base_zone = self.base_zone
+        new.resources = self.resources.copy()
+        new.units = {z: u.copy() for z, u in self.units.items()}
+        # Tuples are immutable, so only the outer dict needs copying
+        new.buildings = dict(self.buildings)
+        new.town_center_hp = self.town_center_hp
+        new.production_queue = deque(
+            ProductionItem(p.unit_type, p.turns_left) for p in self.production_queue
+        )
+        new.resources_banked = self.resources_banked
+        new.age = self.age
+        new.villager_tasks = self.villager_tasks.copy()
+        new.building_hp = {z: hp.copy() for z, hp in self.building_hp.items()}
+        new.upgrades = self.upgrades[:]
+        new.attack_bonus = self.attack_bonus
+        new.armor_bonus = self.armor_bonus
+        new.units_killed = self.units_killed
+        new.units_lost = self.units_lost
+        new.total_villagers = self.total_villagers
+        new.buildings_any = self.buildings_any.copy()
+        new.occupied_mask = self.occupied_mask
+        new._score_cache = self._score_cache
+        new._score_dirty = self._score_dirty
+        return new
 
     def to_dict(self) -> dict:
         return {
@@ -97,12 +158,18 @@ class PlayerState:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     turn: int = 1
     players: Dict[str, PlayerState] = field(default_factory=dict)
-    log: List[str] = field(default_factory=list)
+    # Bounded: only the recent tail is ever rendered or fed to observations,
+    # so old entries can drop instead of growing without limit
+    log: Deque[str] = field(default_factory=lambda: deque(maxlen=2000))
     winner: Optional[str] = None  # "A", "B", "draw", or None
+    # Total lines ever appended and how many have been flushed to disk —
+    # lets turn logs write only the lines added since the previous turn
+    _log_total: int = 0
+    _log_cursor: int = 0
 
     @classmethod
     def new_game(cls) -> "GameState":
@@ -113,17 +180,28 @@ class GameState:
 
     def add_log(self, msg: str):
         self.log.append(f"[T{self.turn}] {msg}")
+        self._log_total += 1
 
-    def recent_log(self, n: int = 5) -> List[str]:
-        return self.log[-n:]
+    def recent_log(self, n: int = 5) -> tuple:
+        """Tail of the log as a tuple (serializes as a JSON array)."""
+        size = len(self.log)
+        return tuple(islice(self.log, max(0, size - n), size))
 
     def to_dict(self) -> dict:
         return {
             "turn": self.turn,
             "players": {pid: p.to_dict() for pid, p in self.players.items()},
-            "log": self.log,
+            "log": list(self.log),
             "winner": self.winner,
         }
 
-    def deep_copy(self) -> "GameState":
-        return copy.deepcopy(self)
+    def clone(self) -> "GameState":
+        """Copy the state without copy.deepcopy's reflection overhead."""
+        new = GameState.__new__(GameState)
+        new.turn = self.turn
+        new.players = {pid: p.clone() for pid, p in self.players.items()}
+        new.log = deque(self.log, maxlen=self.log.maxlen)
+        new.winner = self.winner
+        new._log_total = self._log_total
+        new._log_cursor = self._log_cursor
+        return new
@@ -3,25 +3,30 @@ Validate and sanitise raw LLM action dicts.
 Invalid actions are silently dropped (no-op).
 """
 from __future__ import annotations
-from typing import Any, Dict, List
+from sys import intern
+from typing import Any, Dict, List, Tuple
 
 from config import (
-    UNITS, BUILDINGS, ZONES, ADJACENCY,
+    UNITS, BUILDINGS, ZONE_ID, ADJ_MASK,
     UNIT_AGE_REQUIREMENT, BUILDING_AGE_REQUIREMENT,
-    AGE_ADVANCE_COSTS, UPGRADES,
+    UPGRADES,
+    UNIT_COST_VEC, BUILDING_COST_VEC, UPGRADE_COST_VEC, AGE_COST_VEC,
 )
 from engine.state import PlayerState
 
 
-EMPTY_ACTION = {
-    "train": [],
-    "build": [],
-    "move": [],
-    "attack": [],
-    "advance_age": False,
-    "task_villagers": {},
-    "research": [],
-}
+def _empty_action() -> dict:
+    """Fresh no-op action — inner containers must not be shared between
+    turns, since downstream processing mutates them."""
+    return {
+        "train": [],
+        "build": [],
+        "move": [],
+        "attack": [],
+        "advance_age": False,
+        "task_villagers": {},
+        "research": [],
+    }
 
 
 def validate_action(raw: Any, player: PlayerState, turn: int) -> dict:
@@ -30,7 +35,7 @@ def validate_action(raw: Any, player: PlayerState, turn: int) -> dict:
     Returns a clean action dict with only legal entries.
     """
     if not isinstance(raw, dict):
-        return dict(EMPTY_ACTION)
+        return _empty_action()
 
     clean = {
         "train": _validate_train(raw.get("train", []), player),
@@ -44,7 +49,12 @@ def validate_action(raw: Any, player: PlayerState, turn: int) -> dict:
     return clean
 
 
-def _validate_train(items: Any, player: PlayerState) -> List[dict]:
+# The _validate_* loops bind their config tables as default-argument
+# locals so the per-item checks use LOAD_FAST instead of module-global
+# lookups.
+def _validate_train(items: Any, player: PlayerState,
+                    _UNITS=UNITS, _UNIT_AGE_REQUIREMENT=UNIT_AGE_REQUIREMENT,
+                    _UNIT_COST_VEC=UNIT_COST_VEC) -> List[dict]:
     if not isinstance(items, list):
         return []
     valid = []
@@ -53,12 +63,15 @@ def _validate_train(items: Any, player: PlayerState) -> List[dict]:
             continue
         unit = item.get("unit")
         count = item.get("count", 1)
-        if unit not in UNITS:
+        if unit not in _UNITS:
             continue
+        # Intern JSON-parsed names so downstream dict lookups hit the
+        # pointer-identity fast path against the interned config keys
+        unit = intern(unit)
         if not isinstance(count, int) or count < 1:
             continue
         # Age requirement check
-        if player.age < UNIT_AGE_REQUIREMENT.get(unit, 1):
+        if player.age < _UNIT_AGE_REQUIREMENT.get(unit, 1):
             continue
         # Check building prerequisite
         if unit in ("Militia", "Knight") and not player.any_building("Barracks"):
@@ -66,15 +79,17 @@ def _validate_train(items: Any, player: PlayerState) -> List[dict]:
         if unit == "Archer" and not player.any_building("Range"):
             continue
         # Check resource affordability (greedy: as many as resources allow)
-        cost = UNITS[unit]["cost"]
-        max_affordable = _max_affordable(player.resources, cost, count)
+        max_affordable = _max_affordable(player.resources, _UNIT_COST_VEC[unit], count)
         if max_affordable < 1:
             continue
         valid.append({"unit": unit, "count": max_affordable})
     return valid
 
 
-def _validate_build(items: Any, player: PlayerState) -> List[dict]:
+def _validate_build(items: Any, player: PlayerState,
+                    _BUILDINGS=BUILDINGS,
+                    _BUILDING_AGE_REQUIREMENT=BUILDING_AGE_REQUIREMENT,
+                    _BUILDING_COST_VEC=BUILDING_COST_VEC) -> List[dict]:
     if not isinstance(items, list):
         return []
     valid = []
@@ -82,23 +97,24 @@ def _validate_build(items: Any, player: PlayerState) -> List[dict]:
         if not isinstance(item, dict):
             continue
         building = item.get("building")
-        if building not in BUILDINGS:
+        if building not in _BUILDINGS:
             continue
+        building = intern(building)
         # Age requirement check
-        if player.age < BUILDING_AGE_REQUIREMENT.get(building, 1):
+        if player.age < _BUILDING_AGE_REQUIREMENT.get(building, 1):
             continue
-        cost = BUILDINGS[building]["cost"]
-        if not _can_afford(player.resources, cost):
+        if not _can_afford(player.resources, _BUILDING_COST_VEC[building]):
             continue
         valid.append({"building": building})
     return valid
 
 
-def _validate_move(items: Any, player: PlayerState) -> List[dict]:
+def _validate_move(items: Any, player: PlayerState,
+                   _UNITS=UNITS, _ZONE_ID=ZONE_ID,
+                   _ADJ_MASK=ADJ_MASK) -> List[dict]:
     if not isinstance(items, list):
         return []
     valid = []
-    zone_names = set(ZONES)
     for item in items:
         if not isinstance(item, dict):
             continue
@@ -106,11 +122,14 @@ def _validate_move(items: Any, player: PlayerState) -> List[dict]:
         count = item.get("count", 1)
         from_zone = item.get("from")
         to_zone = item.get("to")
-        if unit not in UNITS:
+        if unit not in _UNITS:
             continue
-        if from_zone not in zone_names or to_zone not in zone_names:
+        if from_zone not in _ZONE_ID or to_zone not in _ZONE_ID:
             continue
-        if to_zone not in ADJACENCY.get(from_zone, set()):
+        unit = intern(unit)
+        from_zone = intern(from_zone)
+        to_zone = intern(to_zone)
+        if not (_ADJ_MASK[_ZONE_ID[from_zone]] >> _ZONE_ID[to_zone]) & 1:
             continue
         if not isinstance(count, int) or count < 1:
             continue
@@ -128,7 +147,7 @@ def _validate_advance_age(flag: Any, player: PlayerState) -> bool:
     if player.age >= 4:
         return False
     next_age = player.age + 1
-    cost = AGE_ADVANCE_COSTS.get(next_age, {})
+    cost = AGE_COST_VEC.get(next_age, (0, 0, 0))
     return _can_afford(player.resources, cost)
 
 
@@ -142,13 +161,10 @@ def _validate_task_villagers(tasks: Any, player: PlayerState) -> dict:
             continue
         if not isinstance(count, int) or count < 0:
             continue
-        cleaned[res] = count
+        cleaned[intern(res)] = count
 
-    # Total villagers across all zones
-    total_villagers = sum(
-        zone_units.get("Villager", 0)
-        for zone_units in player.units.values()
-    )
+    # Maintained incrementally on graduation and combat loss
+    total_villagers = player.total_villagers
 
     # Scale down if tasked exceeds total
     total_tasked = sum(cleaned.values())
@@ -161,7 +177,9 @@ def _validate_task_villagers(tasks: Any, player: PlayerState) -> dict:
     return cleaned
 
 
-def _validate_research(items: Any, player: PlayerState) -> List[dict]:
+def _validate_research(items: Any, player: PlayerState,
+                       _UPGRADES=UPGRADES,
+                       _UPGRADE_COST_VEC=UPGRADE_COST_VEC) -> List[dict]:
     if not isinstance(items, list):
         return []
     valid = []
@@ -169,11 +187,12 @@ def _validate_research(items: Any, player: PlayerState) -> List[dict]:
         if not isinstance(item, dict):
             continue
         upgrade_name = item.get("upgrade")
-        if upgrade_name not in UPGRADES:
+        if upgrade_name not in _UPGRADES:
             continue
+        upgrade_name = intern(upgrade_name)
         if upgrade_name in player.upgrades:
             continue  # already researched
-        upg = UPGRADES[upgrade_name]
+        upg = _UPGRADES[upgrade_name]
         # Age requirement
         if player.age < upg["age"]:
             continue
@@ -186,22 +205,30 @@ def _validate_research(items: Any, player: PlayerState) -> List[dict]:
         if req_upgrade and req_upgrade not in player.upgrades:
             continue
         # Affordability
-        if not _can_afford(player.resources, upg["cost"]):
+        if not _can_afford(player.resources, _UPGRADE_COST_VEC[upgrade_name]):
             continue
         valid.append({"upgrade": upgrade_name})
     return valid
 
 
-def _can_afford(resources: Dict[str, int], cost: Dict[str, int]) -> bool:
-    return all(resources.get(r, 0) >= cost.get(r, 0) for r in cost)
+def _can_afford(resources: Dict[str, int], cost_vec: Tuple[int, int, int]) -> bool:
+    food, wood, gold = cost_vec
+    return (resources["food"] >= food
+            and resources["wood"] >= wood
+            and resources["gold"] >= gold)
 
 
-def _max_affordable(resources: Dict[str, int], cost: Dict[str, int], requested: int) -> int:
+def _max_affordable(resources: Dict[str, int], cost_vec: Tuple[int, int, int],
+                    requested: int) -> int:
     """Return how many units can be afforded up to requested."""
+    food, wood, gold = cost_vec
     max_count = requested
-    for res, amount in cost.items():
-        if amount > 0:
-            max_count = min(max_count, resources.get(res, 0) // amount)
+    if food:
+        max_count = min(max_count, resources["food"] // food)
+    if wood:
+        max_count = min(max_count, resources["wood"] // wood)
+    if gold:
+        max_count = min(max_count, resources["gold"] // gold)
     return max(0, max_count)
 
 
@@ -210,7 +237,7 @@ def deduct_costs(action: dict, player: PlayerState) -> None:
     Train costs are already deducted in _process_trains."""
     for item in action.get("build", []):
         building = item["building"]
-        cost = BUILDINGS[building]["cost"]
-        for res, amount in cost.items():
-            player.resources[res] = player.resources.get(res, 0) - amount
+        for res, amount in BUILDINGS[building]["_cost_tuple"]:
+            player.resources[res] -= amount
             player.resources_banked += amount
+        player._score_dirty = True
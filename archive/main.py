@@ -12,6 +12,8 @@ import asyncio
 import os
 import sys
 
+import orjson
+
 # Ensure UTF-8 output on Windows terminals
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
@@ -19,7 +21,7 @@ if hasattr(sys.stderr, "reconfigure"):
     sys.stderr.reconfigure(encoding="utf-8")
 
 from engine.state import GameState
-from engine.resolver import run_turn
+from engine.resolver import run_turn, save_final_snapshot, flush_turn_logs
 from display.renderer import Renderer
 
 
@@ -102,6 +104,24 @@ async def main():
             from web.server import stop_event as _stop_event
             _stop_event.clear()
 
+        # Broadcast deltas, not full history: re-serializing the whole log
+        # each turn made payloads grow quadratically over a game. The delta
+        # is encoded to JSON bytes once here, so broadcast fans the same
+        # buffer out to every connected client instead of re-serializing
+        # per socket; browsers JSON.parse the binary frame.
+        log_cursor = 0
+
+        def _delta() -> bytes:
+            nonlocal log_cursor
+            new_lines = gs.recent_log(gs._log_total - log_cursor)
+            log_cursor = gs._log_total
+            return orjson.dumps({
+                "turn": gs.turn,
+                "players": {pid: p.to_dict() for pid, p in gs.players.items()},
+                "winner": gs.winner,
+                "log_append": new_lines,
+            })
+
         winner = None
         for turn in range(1, max_turns + 1):
             try:
@@ -113,7 +133,7 @@ async def main():
                 break
 
             if web_broadcast:
-                await web_broadcast(gs.to_dict())
+                await web_broadcast(_delta())
 
             if _stop_event and _stop_event.is_set():
                 break
@@ -138,7 +158,7 @@ async def main():
             )
             gs.add_log(result_msg)
             if web_broadcast:
-                await web_broadcast(gs.to_dict())
+                await web_broadcast(_delta())
 
         score_a = gs.players["A"].score()
         score_b = gs.players["B"].score()
@@ -151,6 +171,8 @@ async def main():
         console.print(f"Final scores — A: {score_a}  B: {score_b}")
 
         if log_dir:
+            await flush_turn_logs()
+            save_final_snapshot(gs, log_dir)
             console.print(f"\nGame log saved to: [dim]{log_dir}/[/dim]")
 
         if uvicorn_server:
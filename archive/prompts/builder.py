@@ -2,18 +2,31 @@
 Builds system prompt (rules) and per-turn observation prompt.
 """
 from __future__ import annotations
+import functools
+import sys
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from engine.state import GameState
 
-from config import ZONES
+from config import ZONES, ZONE_ID
 
+# Built from ZONES so the members are the interned config strings, not
+# fresh literals
 OWN_HALF = {
-    "A": {"Base_A", "Top_A", "Mid_A", "Bot_A"},
-    "B": {"Base_B", "Top_B", "Mid_B", "Bot_B"},
+    "A": frozenset(z for z in ZONES if z.endswith("_A")),
+    "B": frozenset(z for z in ZONES if z.endswith("_B")),
 }
 
+# Bitmask form over ZONE_ID, same encoding as config.ADJ_MASK and
+# PlayerState.occupied_mask — visibility math is then pure int ops
+OWN_HALF_MASK = {
+    pid: sum(1 << ZONE_ID[z] for z in zones) for pid, zones in OWN_HALF.items()
+}
+
+_OTHER = {"A": "B", "B": "A"}
+
 SYSTEM_PROMPT = """\
 You are an AI general commanding a civilization in "Age of Agents", a turn-based strategy game.
 Your persona/strategy: {persona}
@@ -90,62 +103,115 @@ Always call submit_action (or output JSON) with your orders. Be strategic!
 """
 
 
-def build_observation(gs: "GameState", pid: str) -> dict:
+# The template's only placeholder is {persona}; the rest of the braces
+# are {{ }} escapes for .format. Un-double them once at import and split
+# around the persona slot, so building a prompt is two concatenations
+# instead of a full format-string parse over the ~3 KB template.
+_SYS_PREFIX, _SYS_SUFFIX = (
+    SYSTEM_PROMPT.replace("{{", "{").replace("}}", "}").split("{persona}", 1)
+)
+
+
+@functools.lru_cache(maxsize=8)
+def get_system_prompt(persona: str) -> str:
+    """Build the system prompt for a persona once per process.
+
+    Interning keeps the string identical across agents so provider
+    prompt-cache keys (and Python comparisons) stay stable.
+    """
+    return sys.intern(_SYS_PREFIX + persona + _SYS_SUFFIX)
+
+
+def snapshot_units(gs: "GameState") -> dict:
+    """Copy every player's zone unit dicts once for this turn.
+
+    Both observations read the same snapshot: a player's units appear in
+    their own your_state and, where visible, in the opponent's
+    enemy_units_by_zone — sharing the copies halves the per-turn dict
+    building. Safe because observations are serialized before the engine
+    mutates state again.
+    """
+    return {
+        pid: {zone: dict(p.units[zone]) for zone in ZONES}
+        for pid, p in gs.players.items()
+    }
+
+
+@dataclass(slots=True)
+class Observation:
+    """Per-player view of the game, fog of war applied.
+
+    A fixed-shape slots instance instead of a dict literal: the seven
+    fields are assigned once and never resized, and attribute access in
+    compact() skips the hashing a dict lookup pays per key.
     """
-    Build a per-player observation dict (fog of war applied).
+    turn: int
+    you: str
+    your_state: dict
+    enemy_units_by_zone: dict
+    enemy_age: int
+    enemy_town_center_hp: int
+    recent_events: tuple
+
+
+def build_observation(gs: "GameState", pid: str,
+                      units_snapshot: dict = None) -> Observation:
     """
-    player = gs.players[pid]
-    enemy_pid = "B" if pid == "A" else "A"
-    enemy = gs.players[enemy_pid]
+    Build a per-player observation (fog of war applied).
+    """
+    enemy_pid = _OTHER[pid]
+    player, enemy = gs.players[pid], gs.players[enemy_pid]
+    if units_snapshot is None:
+        units_snapshot = snapshot_units(gs)
 
     # Determine which zones are visible
-    # Always see own half; also see enemy zones where player has units
-    player_occupied = {zone for zone, units in player.units.items()
-                       if any(v > 0 for v in units.values())}
-    visible_to_player = player_occupied | OWN_HALF[pid]
-
-    visible_zones = {}
-    for zone in ZONES:
-        my_units = {k: v for k, v in player.units.get(zone, {}).items() if v > 0}
-        if zone in visible_to_player:
-            enemy_units = {k: v for k, v in enemy.units.get(zone, {}).items() if v > 0}
-        else:
-            enemy_units = {}
-        visible_zones[zone] = {
-            "your_units": my_units,
-            "enemy_units": enemy_units,
-        }
-
-    obs = {
-        "turn": gs.turn,
-        "you": pid,
-        "your_state": {
-            "resources": dict(player.resources),
-            "units": {
-                zone: {k: v for k, v in units.items() if v > 0}
-                for zone, units in player.units.items()
-            },
+    # Always see own half; also see enemy zones where player has units.
+    # occupied_mask is maintained at the engine's mutation sites, so
+    # visibility is a single int OR with no per-zone rescan.
+    vis_mask = player.occupied_mask | OWN_HALF_MASK[pid]
+
+    # Flat SoA shape: own units live only in your_state.units, enemy
+    # units in one zone→units map covering visible zones — no per-zone
+    # two-key wrapper dicts. Both maps alias the shared turn snapshot.
+    my_units_per_zone = units_snapshot[pid]
+    e_units = units_snapshot[enemy_pid]
+    enemy_units_by_zone = {
+        zone: e_units[zone]
+        for zid, zone in enumerate(ZONES)
+        if (vis_mask >> zid) & 1
+    }
+
+    return Observation(
+        turn=gs.turn,
+        you=pid,
+        # Observations are serialized immediately and never mutated, so
+        # live state containers go in by reference — no defensive copies
+        your_state={
+            "resources": player.resources,
+            "units": my_units_per_zone,
             "buildings": {
-                zone: list(blist)
+                zone: blist
                 for zone, blist in player.buildings.items()
                 if blist
             },
             "building_hp": {
-                zone: dict(hp)
+                zone: hp
                 for zone, hp in player.building_hp.items()
                 if hp
             },
             "town_center_hp": player.town_center_hp,
-            "production_queue": [p.to_dict() for p in player.production_queue],
+            # Raw deque of ProductionItem — converted lazily by the
+            # serializer's default hook (agents/obs_compact.json_default)
+            # instead of materialising a list of dicts every turn
+            "production_queue": player.production_queue,
             "age": player.age,
-            "villager_tasks": dict(player.villager_tasks),
-            "upgrades": list(player.upgrades),
+            "villager_tasks": player.villager_tasks,
+            "upgrades": player.upgrades,
             "attack_bonus": player.attack_bonus,
             "armor_bonus": player.armor_bonus,
         },
-        "visible_zones": visible_zones,
-        "enemy_age": enemy.age,
-        "enemy_town_center_hp": enemy.town_center_hp,
-        "recent_events": gs.recent_log(5),
-    }
-    return obs
+        enemy_units_by_zone=enemy_units_by_zone,
+        enemy_age=enemy.age,
+        enemy_town_center_hp=enemy.town_center_hp,
+        recent_events=gs.recent_log(5),
+    )